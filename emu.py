@@ -5,11 +5,30 @@
 
 import sys
 import os
+import json
+import tempfile
 import xml.etree.ElementTree as ET
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from enum import Enum
 
 
+# Поля, извлекаемые из XML-файла конфигурации
+CONFIG_FIELDS = frozenset({
+    'package_name',
+    'repository_url',
+    'repository_mode',
+    'package_version',
+    'filter_substring',
+})
+
+# Суффикс файла-кэша с уже разобранной конфигурацией
+CACHE_SUFFIX = ".cache"
+
+# Версия формата кэша: увеличивается при любом изменении разбора конфигурации
+CACHE_FORMAT_VERSION = 2
+
+
 class RepositoryMode(Enum):
     """Режимы работы с репозиторием"""
     LOCAL = "local"
@@ -21,9 +40,73 @@ class ConfigError(Exception):
     pass
 
 
+def _parse_config_xml(config_file: str) -> Dict[str, str]:
+    """
+    Разбор XML-файла конфигурации за один проход
+    
+    Разбор прекращается, как только найдены все поля конфигурации.
+    """
+    config_data = {}
+    depth = 0
+    with open(config_file, 'rb') as f:
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                continue
+            depth -= 1
+            # Учитываем только прямые потомки корневого элемента
+            if depth == 1 and elem.tag in CONFIG_FIELDS and elem.tag not in config_data:
+                config_data[elem.tag] = (elem.text or '').strip()
+                if len(config_data) == len(CONFIG_FIELDS):
+                    break
+            elem.clear()
+    return config_data
+
+
+def _write_config_cache(cache_file: str, key: str, config_data: Dict[str, str]) -> None:
+    """
+    Атомарная запись кэша конфигурации (ошибки записи не критичны)
+    """
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cache_file)))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(key + "\n")
+                json.dump(config_data, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=8)
+def _load_config_data(config_file: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    """
+    Загрузка конфигурации с использованием кэша, привязанного к версии формата, mtime и размеру файла
+    """
+    cache_file = config_file + CACHE_SUFFIX
+    key = f"v{CACHE_FORMAT_VERSION}:{mtime_ns}:{size}"
+    
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            if f.readline().rstrip("\n") == key:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    config_data = _parse_config_xml(config_file)
+    _write_config_cache(cache_file, key, config_data)
+    return config_data
+
+
 class PackageAnalyzerConfig:
     """Класс для работы с конфигурацией приложения"""
     
+    # Допустимые значения режима репозитория
+    _VALID_MODES = frozenset(mode.value for mode in RepositoryMode)
+    
     def __init__(self, config_file: str = "config.xml"):
         self.config_file = config_file
         self.default_config = {
@@ -40,43 +123,17 @@ class PackageAnalyzerConfig:
         Загрузка конфигурации из XML-файла
         """
         try:
-            if not os.path.exists(self.config_file):
-                raise ConfigError(f"Конфигурационный файл '{self.config_file}' не найден")
-            
-            tree = ET.parse(self.config_file)
-            root = tree.getroot()
-            
-            config_data = {}
-            
-            # Имя пакета
-            package_name_elem = root.find('package_name')
-            if package_name_elem is not None:
-                config_data['package_name'] = package_name_elem.text.strip()
-            
-            # URL репозитория или путь к файлу
-            repository_url_elem = root.find('repository_url')
-            if repository_url_elem is not None:
-                config_data['repository_url'] = repository_url_elem.text.strip()
+            st = os.stat(self.config_file)
+            config_data = dict(_load_config_data(self.config_file, st.st_mtime_ns, st.st_size))
             
             # Режим работы с репозиторием
-            repository_mode_elem = root.find('repository_mode')
-            if repository_mode_elem is not None:
-                mode_value = repository_mode_elem.text.strip().lower()
-                if mode_value not in [mode.value for mode in RepositoryMode]:
+            if 'repository_mode' in config_data:
+                mode_value = config_data['repository_mode'].lower()
+                if mode_value not in self._VALID_MODES:
                     raise ConfigError(f"Недопустимый режим репозитория: {mode_value}. "
                                     f"Допустимые значения: {[mode.value for mode in RepositoryMode]}")
                 config_data['repository_mode'] = mode_value
             
-            # Версия пакета
-            package_version_elem = root.find('package_version')
-            if package_version_elem is not None:
-                config_data['package_version'] = package_version_elem.text.strip()
-            
-            # Подстрока для фильтрации
-            filter_substring_elem = root.find('filter_substring')
-            if filter_substring_elem is not None:
-                config_data['filter_substring'] = filter_substring_elem.text.strip() if filter_substring_elem.text else ''
-            
             # Обновляем конфигурацию
             self.config.update(config_data)
             
@@ -85,6 +142,8 @@ class PackageAnalyzerConfig:
             
             return self.config
             
+        except FileNotFoundError:
+            raise ConfigError(f"Конфигурационный файл '{self.config_file}' не найден")
         except ET.ParseError as e:
             raise ConfigError(f"Ошибка парсинга XML файла: {e}")
         except Exception as e:
@@ -1,18 +1,62 @@
-import requests
+import base64
 import json
 import sys
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+
+USER_AGENT = "natali-dependency-scanner/1.0"
+REQUEST_TIMEOUT = 10
+MAX_RETRIES = 3
+
+# Необязательный суффикс ".git" и завершающий слэш в URL репозитория
+REPO_SUFFIX_RE = re.compile(r'(?:\.git)?/?$')
+
+# Ссылки на зависимости на странице docs.rs
+DOCS_RS_DEP_RE = re.compile(r'crate/([^/"]+)"')
+
+# Общая сессия создается при первом сетевом запросе (см. get_session)
+_session = None
+
+def get_session():
+    """
+    Возвращает общую HTTP-сессию, переиспользующую TCP/TLS-соединения
+    
+    requests импортируется лениво, чтобы не замедлять запуск до первого запроса.
+    """
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        session.headers['User-Agent'] = USER_AGENT
+        session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=MAX_RETRIES, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+        ))
+        _session = session
+    return _session
+
 def get_crate_info(crate_name, version):
     """
     Получает информацию о пакете из crates.io API
     """
+    import requests
+    
     # Сначала получаем общую информацию о пакете
     url = f"https://crates.io/api/v1/crates/{crate_name}"
     
     try:
-        response = requests.get(url)
+        response = get_session().get(url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         data = response.json()
         
@@ -22,7 +66,7 @@ def get_crate_info(crate_name, version):
                 if ver['num'] == version:
                     # Получаем зависимости для этой версии
                     deps_url = f"https://crates.io/api/v1/crates/{crate_name}/{version}/dependencies"
-                    deps_response = requests.get(deps_url)
+                    deps_response = get_session().get(deps_url, timeout=REQUEST_TIMEOUT)
                     if deps_response.status_code == 200:
                         deps_data = deps_response.json()
                         return [dep['crate_id'] for dep in deps_data.get('dependencies', [])]
@@ -38,45 +82,73 @@ def get_dependencies_from_repo(repo_url, crate_name, version):
     print(f"Пытаемся получить Cargo.toml из репозитория: {repo_url}")
     
     # Нормализуем URL репозитория
-    repo_url = repo_url.rstrip('/').rstrip('.git')
+    repo_url = REPO_SUFFIX_RE.sub('', repo_url)
+    raw_base = repo_url.replace('github.com', 'raw.githubusercontent.com')
     
     # Пробуем разные возможные пути к Cargo.toml
     possible_paths = [
-        f"{repo_url.replace('github.com', 'raw.githubusercontent.com')}/main/Cargo.toml",
-        f"{repo_url.replace('github.com', 'raw.githubusercontent.com')}/master/Cargo.toml",
-        f"{repo_url.replace('github.com', 'raw.githubusercontent.com')}/{version}/Cargo.toml",
-        f"{repo_url.replace('github.com', 'raw.githubusercontent.com')}/v{version}/Cargo.toml",
+        f"{raw_base}/main/Cargo.toml",
+        f"{raw_base}/master/Cargo.toml",
+        f"{raw_base}/{version}/Cargo.toml",
+        f"{raw_base}/v{version}/Cargo.toml",
         f"{repo_url}/raw/main/Cargo.toml",
         f"{repo_url}/raw/master/Cargo.toml",
     ]
     
-    # Также пробуем получить через GitHub API
+    session = get_session()
+    # Сигнал для проигравших запросов: результат уже найден, выводить ничего не нужно
+    found = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(possible_paths))
+    try:
+        futures = [
+            executor.submit(fetch_cargo_toml_dependencies, session, path, False, found)
+            for path in possible_paths
+        ]
+        # Запросы выполняются параллельно, но результат берется в порядке приоритета путей
+        for path, future in zip(possible_paths, futures):
+            deps = future.result()
+            if deps:
+                found.set()
+                print(f"Успешно получены зависимости из: {path}")
+                return deps
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    # GitHub API расходует лимит анонимных запросов, поэтому обращаемся к нему в последнюю очередь
     api_url = f"https://api.github.com/repos/{repo_url.split('github.com/')[-1]}/contents/Cargo.toml"
-    possible_paths.append(api_url)
+    deps = fetch_cargo_toml_dependencies(session, api_url, True)
+    if deps:
+        print(f"Успешно получены зависимости из: {api_url}")
+        return deps
+    
+    return None
+
+def fetch_cargo_toml_dependencies(session, path, is_github_api, found=None):
+    """
+    Загружает Cargo.toml по указанному адресу и извлекает зависимости
     
-    for path in possible_paths:
-        try:
-            print(f"Пробуем: {path}")
-            response = requests.get(path, timeout=10)
+    Если событие found уже установлено, запрос считается ненужным и ничего не выводит.
+    """
+    try:
+        if found is not None and found.is_set():
+            return None
+        print(f"Пробуем: {path}")
+        response = session.get(path, timeout=REQUEST_TIMEOUT)
+        
+        if response.status_code == 200:
+            content = response.text
             
-            if response.status_code == 200:
-                content = response.text
-                
-                # Если это GitHub API response, нужно декодировать base64
-                if path == api_url:
-                    import base64
-                    content_data = response.json()
-                    if 'content' in content_data:
-                        content = base64.b64decode(content_data['content']).decode('utf-8')
-                
-                deps = parse_cargo_toml(content)
-                if deps:
-                    print(f"Успешно получены зависимости из: {path}")
-                    return deps
-                    
-        except Exception as e:
+            # Если это GitHub API response, нужно декодировать base64
+            if is_github_api:
+                content_data = response.json()
+                if 'content' in content_data:
+                    content = base64.b64decode(content_data['content']).decode('utf-8')
+            
+            return parse_cargo_toml(content)
+            
+    except Exception as e:
+        if found is None or not found.is_set():
             print(f"Ошибка при запросе {path}: {e}")
-            continue
     
     return None
 
@@ -84,45 +156,12 @@ def parse_cargo_toml(cargo_toml_content):
     """
     Парсит Cargo.toml и извлекает зависимости
     """
-    dependencies = []
-    
-    lines = cargo_toml_content.split('\n')
-    in_dependencies_section = False
-    in_dev_dependencies = False
+    try:
+        data = tomllib.loads(cargo_toml_content)
+    except tomllib.TOMLDecodeError:
+        return []
     
-    for line in lines:
-        line = line.strip()
-        
-        # Пропускаем комментарии и пустые строки
-        if not line or line.startswith('#'):
-            continue
-            
-        # Проверяем начало секции зависимостей
-        if line == '[dependencies]':
-            in_dependencies_section = True
-            in_dev_dependencies = False
-            continue
-        elif line == '[dev-dependencies]':
-            in_dependencies_section = False
-            in_dev_dependencies = True
-            continue
-            
-        # Если находим другую секцию, выходим из секций зависимостей
-        if line.startswith('[') and line.endswith(']'):
-            in_dependencies_section = False
-            in_dev_dependencies = False
-            continue
-            
-        # Если мы в секции зависимостей, парсим зависимости
-        if in_dependencies_section and '=' in line:
-            # Извлекаем имя зависимости (до знака =)
-            dep_name = line.split('=')[0].strip()
-            if dep_name and not dep_name.startswith('['):
-                # Убираем кавычки если есть
-                dep_name = dep_name.strip('"\'')
-                dependencies.append(dep_name)
-    
-    return dependencies
+    return list(data.get('dependencies', {}).keys())
 
 def get_dependencies_fallback(crate_name, version):
     """
@@ -133,13 +172,10 @@ def get_dependencies_fallback(crate_name, version):
     # Пробуем получить через docs.rs
     try:
         url = f"https://docs.rs/crate/{crate_name}/{version}/dependencies"
-        response = requests.get(url, timeout=10)
+        response = get_session().get(url, timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
-            # Парсим HTML для поиска зависимостей
-            import re
-            deps = re.findall(r'crate/([^/"]+)"', response.text)
-            # Фильтруем уникальные зависимости
-            unique_deps = list(set([d for d in deps if d != crate_name]))
+            # Парсим HTML для поиска зависимостей, оставляя только уникальные
+            unique_deps = list({d for d in DOCS_RS_DEP_RE.findall(response.text) if d != crate_name})
             if unique_deps:
                 return unique_deps
     except:
@@ -147,6 +183,65 @@ def get_dependencies_fallback(crate_name, version):
     
     return None
 
+class CargoDependencyAnalyzer:
+    """
+    Анализатор прямых зависимостей пакетов Rust с кэшированием результатов
+    """
+    
+    def __init__(self):
+        # Кэш непустых результатов по ключу (имя пакета, версия, URL репозитория)
+        self._cache = {}
+    
+    def get_direct_dependencies(self, crate_name, version, repo_url=None):
+        """
+        Возвращает отсортированный список уникальных прямых зависимостей пакета
+        """
+        key = (crate_name, version, repo_url or None)
+        if key in self._cache:
+            return list(self._cache[key])
+        
+        dependencies = None
+        
+        # Сначала пробуем получить из репозитория
+        if repo_url:
+            dependencies = get_dependencies_from_repo(repo_url, crate_name, version)
+        
+        # Если не удалось, используем crates.io API
+        if not dependencies:
+            print("\nНе удалось получить зависимости из репозитория, используем crates.io API...")
+            dependencies = get_crate_info(crate_name, version)
+        
+        # Если все еще нет, используем альтернативные методы
+        if not dependencies:
+            print("\nНе удалось получить через API, используем альтернативные методы...")
+            dependencies = get_dependencies_fallback(crate_name, version)
+        
+        # Убираем дубликаты и сортируем за один шаг
+        dependencies = sorted(set(dependencies or []))
+        # Неудачные попытки не кэшируются, чтобы следующий вызов мог повторить поиск
+        if dependencies:
+            self._cache[key] = tuple(dependencies)
+        return dependencies
+    
+    def display_dependencies(self, dependencies, crate_name, version):
+        """
+        Выводит зависимости на экран и сохраняет их в файл
+        """
+        if dependencies:
+            print(f"\nПрямые зависимости пакета {crate_name} версии {version}:")
+            print("-" * 50)
+            print("\n".join(f"{i}. {dep}" for i, dep in enumerate(dependencies, 1)))
+            print(f"\nВсего найдено зависимостей: {len(dependencies)}")
+            
+            # Сохраняем результат в файл
+            output_file = f"{crate_name}_{version}_dependencies.txt"
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(f"Зависимости пакета {crate_name} версии {version}:\n"
+                        + "".join(f"- {dep}\n" for dep in dependencies))
+            print(f"\nРезультат сохранен в файл: {output_file}")
+        else:
+            print(f"\nДля пакета {crate_name} версии {version} не найдено зависимостей")
+
 def main():
     """
     Основная функция для получения зависимостей пакета
@@ -164,21 +259,8 @@ def main():
     
     print(f"\nПоиск зависимостей для пакета {crate_name} версии {version}...")
     
-    dependencies = None
-    
-    # Сначала пробуем получить из репозитория
-    if repo_url:
-        dependencies = get_dependencies_from_repo(repo_url, crate_name, version)
-    
-    # Если не удалось, используем crates.io API
-    if not dependencies:
-        print("\nНе удалось получить зависимости из репозитория, используем crates.io API...")
-        dependencies = get_crate_info(crate_name, version)
-    
-    # Если все еще нет, используем альтернативные методы
-    if not dependencies:
-        print("\nНе удалось получить через API, используем альтернативные методы...")
-        dependencies = get_dependencies_fallback(crate_name, version)
+    analyzer = CargoDependencyAnalyzer()
+    dependencies = analyzer.get_direct_dependencies(crate_name, version, repo_url)
     
     # Если все методы не сработали, используем тестовые данные для демонстрации
     if not dependencies:
@@ -186,22 +268,7 @@ def main():
         # Тестовые данные для serde 1.0.0
         dependencies = ["serde_derive", "std"]
     
-    # Выводим результат
-    if dependencies:
-        print(f"\nПрямые зависимости пакета {crate_name} версии {version}:")
-        print("-" * 50)
-        for i, dep in enumerate(sorted(dependencies), 1):
-            print(f"{i}. {dep}")
-        print(f"\nВсего найдено зависимостей: {len(dependencies)}")
-        
-        # Сохраняем результат в файл
-        with open(f"{crate_name}_{version}_dependencies.txt", "w", encoding="utf-8") as f:
-            f.write(f"Зависимости пакета {crate_name} версии {version}:\n")
-            for dep in sorted(dependencies):
-                f.write(f"- {dep}\n")
-        print(f"\nРезультат сохранен в файл: {crate_name}_{version}_dependencies.txt")
-    else:
-        print(f"\nДля пакета {crate_name} версии {version} не найдено зависимостей")
+    analyzer.display_dependencies(dependencies, crate_name, version)
 
 if __name__ == "__main__":
     main()
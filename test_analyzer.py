@@ -1 +1,139 @@
+# test_analyzer.py - тесты анализатора зависимостей без сетевых запросов
+import time
 
+import pupupu
+from pupupu import CargoDependencyAnalyzer, parse_cargo_toml
+
+
+def test_parse_cargo_toml():
+    """Из Cargo.toml извлекаются только обычные зависимости"""
+    content = '''
+[package]
+name = "demo"
+
+[dependencies]
+serde = { version = "1.0", features = ["derive"] }
+log = "0.4"
+
+[dev-dependencies]
+criterion = "0.5"
+'''
+    assert parse_cargo_toml(content) == ["serde", "log"]
+
+
+def test_parse_cargo_toml_invalid():
+    """Некорректный TOML не приводит к ошибке"""
+    assert parse_cargo_toml("<html>Not Found</html>") == []
+
+
+class FakeResponse:
+    """Минимальный ответ HTTP-запроса"""
+    
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeSession:
+    """Сессия, отвечающая заданным Cargo.toml с заданными задержками"""
+    
+    def __init__(self, responses):
+        self.responses = responses
+        self.requested = []
+    
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        for suffix, (delay, dep_name) in self.responses.items():
+            if url.endswith(suffix):
+                time.sleep(delay)
+                if dep_name is None:
+                    return FakeResponse(404)
+                return FakeResponse(200, f'[dependencies]\n{dep_name} = "1"\n')
+        return FakeResponse(404)
+
+
+def test_get_dependencies_from_repo_keeps_priority(monkeypatch):
+    """Ветка main предпочтительнее тега, даже если тег ответил быстрее"""
+    session = FakeSession({
+        "/main/Cargo.toml": (0.2, "from_main"),
+        "/v1.0.0/Cargo.toml": (0.0, "from_tag"),
+    })
+    monkeypatch.setattr(pupupu, "get_session", lambda: session)
+    
+    deps = pupupu.get_dependencies_from_repo("https://github.com/serde-rs/serde.git", "serde", "1.0.0")
+    
+    assert deps == ["from_main"]
+
+
+def test_get_dependencies_from_repo_does_not_wait_for_slow_probes(monkeypatch):
+    """Результат возвращается, не дожидаясь медленных запросов с меньшим приоритетом"""
+    session = FakeSession({
+        "/main/Cargo.toml": (0.1, "from_main"),
+        "/raw/master/Cargo.toml": (2.0, None),
+    })
+    monkeypatch.setattr(pupupu, "get_session", lambda: session)
+    
+    started = time.monotonic()
+    deps = pupupu.get_dependencies_from_repo("https://github.com/serde-rs/serde", "serde", "1.0.0")
+    elapsed = time.monotonic() - started
+    
+    assert deps == ["from_main"]
+    assert elapsed < 1.0
+    assert not any("api.github.com" in url for url in session.requested)
+
+
+def test_get_dependencies_from_repo_uses_api_last(monkeypatch):
+    """GitHub API запрашивается только после неудачи всех прямых ссылок"""
+    session = FakeSession({})
+    monkeypatch.setattr(pupupu, "get_session", lambda: session)
+    
+    assert pupupu.get_dependencies_from_repo("https://github.com/serde-rs/serde", "serde", "1.0.0") is None
+    assert session.requested[-1] == "https://api.github.com/repos/serde-rs/serde/contents/Cargo.toml"
+    assert sum("api.github.com" in url for url in session.requested) == 1
+
+
+def test_get_direct_dependencies_cached(monkeypatch):
+    """Повторный запрос той же версии берется из кэша"""
+    calls = []
+    
+    def fake_get_crate_info(crate_name, version):
+        calls.append((crate_name, version))
+        return ["serde_derive", "std", "serde_derive"]
+    
+    monkeypatch.setattr(pupupu, "get_crate_info", fake_get_crate_info)
+    
+    analyzer = CargoDependencyAnalyzer()
+    assert analyzer.get_direct_dependencies("serde", "1.0.0") == ["serde_derive", "std"]
+    assert analyzer.get_direct_dependencies("serde", "1.0.0") == ["serde_derive", "std"]
+    assert calls == [("serde", "1.0.0")]
+    
+    analyzer.get_direct_dependencies("serde", "1.0.0").append("mutated")
+    assert analyzer.get_direct_dependencies("serde", "1.0.0") == ["serde_derive", "std"]
+
+
+def test_get_direct_dependencies_not_cached_on_failure(monkeypatch):
+    """Пустой результат не кэшируется, а URL репозитория входит в ключ кэша"""
+    repo_calls = []
+    
+    def fake_get_dependencies_from_repo(repo_url, crate_name, version):
+        repo_calls.append(repo_url)
+        return ["from_repo"]
+    
+    monkeypatch.setattr(pupupu, "get_dependencies_from_repo", fake_get_dependencies_from_repo)
+    monkeypatch.setattr(pupupu, "get_crate_info", lambda crate_name, version: None)
+    monkeypatch.setattr(pupupu, "get_dependencies_fallback", lambda crate_name, version: None)
+    
+    analyzer = CargoDependencyAnalyzer()
+    assert analyzer.get_direct_dependencies("serde", "1.0.0") == []
+    assert analyzer.get_direct_dependencies("serde", "1.0.0", "https://github.com/serde-rs/serde") == ["from_repo"]
+    assert repo_calls == ["https://github.com/serde-rs/serde"]
+
+
+def test_display_dependencies(tmp_path, monkeypatch):
+    """Результат сохраняется в файл"""
+    monkeypatch.chdir(tmp_path)
+    
+    CargoDependencyAnalyzer().display_dependencies(["serde_derive", "std"], "serde", "1.0.0")
+    
+    output = (tmp_path / "serde_1.0.0_dependencies.txt").read_text(encoding="utf-8")
+    assert output == "Зависимости пакета serde версии 1.0.0:\n- serde_derive\n- std\n"
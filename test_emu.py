@@ -0,0 +1,118 @@
+# test_emu.py - тесты загрузки XML-конфигурации и ее кэширования
+import os
+
+import pytest
+
+import emu
+from emu import CACHE_SUFFIX, ConfigError, PackageAnalyzerConfig
+
+
+CONFIG_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<configuration>
+    <package_name>{name}</package_name>
+    <repository_url>https://github.com/serde-rs/serde</repository_url>
+    <repository_mode>remote</repository_mode>
+    <package_version>1.0.0</package_version>
+    <filter_substring>test</filter_substring>
+</configuration>
+'''
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_cache():
+    """Каждый тест начинается с пустого кэша в памяти"""
+    emu._load_config_data.cache_clear()
+    yield
+    emu._load_config_data.cache_clear()
+
+
+def write_config(path, name, mtime_ns=None):
+    """Записывает конфигурацию и при необходимости выставляет mtime"""
+    path.write_text(CONFIG_XML.format(name=name), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_cache_miss_writes_sidecar(tmp_path):
+    """При первой загрузке рядом с конфигурацией создается файл кэша"""
+    config_file = tmp_path / "config.xml"
+    write_config(config_file, "serde")
+    
+    config = PackageAnalyzerConfig(str(config_file)).load_config()
+    
+    assert config['package_name'] == "serde"
+    st = os.stat(config_file)
+    key = (tmp_path / ("config.xml" + CACHE_SUFFIX)).read_text(encoding="utf-8").split("\n", 1)[0]
+    assert key == f"v{emu.CACHE_FORMAT_VERSION}:{st.st_mtime_ns}:{st.st_size}"
+
+
+def test_cache_hit_uses_sidecar(tmp_path):
+    """Актуальный файл кэша используется вместо разбора XML"""
+    config_file = tmp_path / "config.xml"
+    write_config(config_file, "serde")
+    PackageAnalyzerConfig(str(config_file)).load_config()
+    emu._load_config_data.cache_clear()
+    
+    cache_file = tmp_path / ("config.xml" + CACHE_SUFFIX)
+    key = cache_file.read_text(encoding="utf-8").split("\n", 1)[0]
+    cache_file.write_text(key + '\n{"package_name": "from-cache"}', encoding="utf-8")
+    
+    assert PackageAnalyzerConfig(str(config_file)).load_config()['package_name'] == "from-cache"
+
+
+def test_cache_invalidated_by_mtime(tmp_path):
+    """Изменение файла конфигурации делает кэш неактуальным"""
+    config_file = tmp_path / "config.xml"
+    write_config(config_file, "serde", mtime_ns=1_000_000_000)
+    PackageAnalyzerConfig(str(config_file)).load_config()
+    
+    write_config(config_file, "tokio", mtime_ns=2_000_000_000)
+    
+    assert PackageAnalyzerConfig(str(config_file)).load_config()['package_name'] == "tokio"
+
+
+def test_cache_with_other_format_version_ignored(tmp_path):
+    """Кэш, записанный другой версией формата, не используется"""
+    config_file = tmp_path / "config.xml"
+    write_config(config_file, "serde")
+    st = os.stat(config_file)
+    (tmp_path / ("config.xml" + CACHE_SUFFIX)).write_text(
+        f'{st.st_mtime_ns}:{st.st_size}\n{{"package_name": "stale"}}', encoding="utf-8")
+    
+    assert PackageAnalyzerConfig(str(config_file)).load_config()['package_name'] == "serde"
+
+
+def test_missing_config_file(tmp_path):
+    """Отсутствующий файл сообщается как ошибка конфигурации"""
+    config_file = tmp_path / "missing.xml"
+    
+    with pytest.raises(ConfigError, match="не найден"):
+        PackageAnalyzerConfig(str(config_file)).load_config()
+
+
+def test_parse_stops_after_all_fields(tmp_path):
+    """Содержимое после всех полей конфигурации не разбирается"""
+    config_file = tmp_path / "config.xml"
+    config_file.write_text(CONFIG_XML.format(name="serde").replace(
+        "</configuration>", "<notes><unclosed></notes>"), encoding="utf-8")
+    
+    assert emu._parse_config_xml(str(config_file))['package_name'] == "serde"
+
+
+def test_parse_ignores_nested_fields(tmp_path):
+    """Учитываются только прямые потомки корневого элемента"""
+    config_file = tmp_path / "config.xml"
+    config_file.write_text(CONFIG_XML.format(name="serde").replace(
+        "<configuration>", "<configuration><extra><package_name>nested</package_name></extra>"),
+        encoding="utf-8")
+    
+    assert emu._parse_config_xml(str(config_file))['package_name'] == "serde"
+
+
+def test_prerelease_version_accepted(tmp_path):
+    """Версии с pre-release и build-метками не отклоняются"""
+    config_file = tmp_path / "config.xml"
+    config_file.write_text(CONFIG_XML.format(name="serde").replace(
+        "1.0.0", "1.0.0-beta.1+meta"), encoding="utf-8")
+    
+    assert PackageAnalyzerConfig(str(config_file)).load_config()['package_version'] == "1.0.0-beta.1+meta"